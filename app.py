@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 from utils.data_processor import DataProcessor
+from utils.shared_dataset import SharedDataset
 from auth.authentication import Authentication
 from st_aggrid import AgGrid, GridOptionsBuilder
 import os
@@ -32,8 +33,26 @@ def load_data():
     )
     return processor, data
 
+# Shared dataset mapped read-only; one copy per version for the whole process.
+# Errors propagate so a failed open is retried on the next rerun, not cached.
+@st.cache_resource(max_entries=2)
+def load_shared_data(directory, version):
+    processor = DataProcessor()
+    data = processor.load_shared(directory, version)
+    return processor, data
+
+SHARED_DATASET_DIR = os.environ.get("SHARED_DATASET_DIR")
+
 # Initialize session state
-if 'data_loaded' not in st.session_state:
+if SHARED_DATASET_DIR:
+    # Pick up newly published versions on the next rerun
+    version = SharedDataset(SHARED_DATASET_DIR).current_version()
+    try:
+        processor, data = load_shared_data(SHARED_DATASET_DIR, version)
+    except Exception as e:
+        st.error(f"Error loading shared data: {str(e)}")
+        processor, data = DataProcessor(), None
+elif 'data_loaded' not in st.session_state:
     processor, data = load_data()
     st.session_state.processor = processor
     st.session_state.data = data
@@ -83,12 +102,34 @@ if auth.authenticated:
                                 employee_id=employee_id,
                                 is_admin=is_admin
                             )
+                            auth.user_db.record_event(
+                                auth.current_user,
+                                "user_created",
+                                f"{username} (admin)" if is_admin else username
+                            )
                             st.success(f"User {username} created successfully!")
             
-            # View all users
+            # Search users, one page at a time
             st.subheader("All Users")
-            users = auth.user_db.get_all_users()
+            col1, col2 = st.columns([3, 1])
+            search = col1.text_input("Search by username or employee ID")
+            # Keyed on the search text so a new search starts from page 1
+            page = col2.number_input("Page", min_value=1, value=1, key=f"user_page_{search}")
+            page_size = 25
+            users, total_users = auth.user_db.get_users(search, page=page, page_size=page_size)
+            total_pages = max(1, -(-total_users // page_size))
+            if page > total_pages:
+                page = total_pages
+                users, total_users = auth.user_db.get_users(search, page=page, page_size=page_size)
             st.dataframe(users)
+            st.caption(f"Page {page} of {total_pages} ({total_users} users)")
+            
+            # Audit log
+            with st.expander("Login & Audit Log"):
+                audit_user = st.text_input("Filter by username")
+                events, total_events = auth.user_db.get_audit_events(username=audit_user)
+                st.dataframe(events)
+                st.caption(f"Showing latest {len(events)} of {total_events} events")
     
     # Employee features
     if not auth.is_admin and auth.employee_id:
@@ -103,16 +144,16 @@ if auth.authenticated:
             emp_data = processor.get_employee_attendance(auth.employee_id)
             
             # Display attendance records
-            gb = GridOptionsBuilder.from_dataframe(
+            records = DataProcessor.format_for_display(
                 emp_data[['Shift_ID', 'Shift_Date', 'Shift_Start', 'Shift_End', 
                          'Timestamp', 'Type', 'Late_Status', 'Early_Status', 'Duration_Hours']]
             )
+            gb = GridOptionsBuilder.from_dataframe(records)
             gb.configure_pagination(paginationAutoPageSize=True)
             grid_options = gb.build()
             
             AgGrid(
-                emp_data[['Shift_ID', 'Shift_Date', 'Shift_Start', 'Shift_End', 
-                         'Timestamp', 'Type', 'Late_Status', 'Early_Status', 'Duration_Hours']],
+                records,
                 gridOptions=grid_options,
                 height=400,
                 width='100%'
@@ -159,13 +200,21 @@ if auth.authenticated:
             total_employees = len(data['Employee_ID'].unique())
             total_shifts = len(data['Shift_ID'].unique())
             avg_duration = data['Duration_Hours'].mean()
-            late_percentage = (data['Late_Status'] == 'Late').mean() * 100
+            late_percentage = (data['Late_Status'] == 'Late').fillna(False).mean() * 100
             
             col1.metric("Total Employees", total_employees)
             col2.metric("Total Shifts Tracked", total_shifts)
             col3.metric("Avg Shift Duration (hrs)", f"{avg_duration:.2f}")
             col4.metric("Late Arrivals (%)", f"{late_percentage:.1f}%")
-            
+
+            # Rows rejected by input validation
+            rejected = processor.rejected_rows
+            if rejected is not None and not rejected.empty:
+                rejected_count = len(rejected[['Source', 'Row']].drop_duplicates())
+                st.warning(f"{rejected_count} input rows failed validation and were excluded")
+                with st.expander("Data Quality Report"):
+                    st.dataframe(rejected)
+
             # Department Distribution
             st.subheader("Department Distribution")
             dept_counts = data['Department'].value_counts().reset_index()
@@ -206,7 +255,7 @@ if auth.authenticated:
             col1, col2, col3 = st.columns(3)
             dept_employees = len(dept_data['Employee_ID'].unique())
             dept_shifts = len(dept_data['Shift_ID'].unique())
-            dept_late = (dept_data['Late_Status'] == 'Late').mean() * 100
+            dept_late = (dept_data['Late_Status'] == 'Late').fillna(False).mean() * 100
             
             col1.metric("Employees in Department", dept_employees)
             col2.metric("Shifts in Department", dept_shifts)
@@ -230,7 +279,7 @@ if auth.authenticated:
             col1, col2, col3 = st.columns(3)
             loc_employees = len(loc_data['Employee_ID'].unique())
             loc_shifts = len(loc_data['Shift_ID'].unique())
-            loc_late = (loc_data['Late_Status'] == 'Late').mean() * 100
+            loc_late = (loc_data['Late_Status'] == 'Late').fillna(False).mean() * 100
             
             col1.metric("Employees at Location", loc_employees)
             col2.metric("Shifts at Location", loc_shifts)
@@ -260,8 +309,10 @@ if auth.authenticated:
             # Attendance Records
             st.subheader("Attendance Records")
             AgGrid(
-                emp_data[['Shift_ID', 'Shift_Date', 'Shift_Start', 'Shift_End', 
-                         'Timestamp', 'Type', 'Late_Status', 'Early_Status', 'Duration_Hours']]
+                DataProcessor.format_for_display(
+                    emp_data[['Shift_ID', 'Shift_Date', 'Shift_Start', 'Shift_End', 
+                             'Timestamp', 'Type', 'Late_Status', 'Early_Status', 'Duration_Hours']]
+                )
             )
     
     # Data Export
@@ -276,10 +327,11 @@ if auth.authenticated:
                 export_data = processor.get_location_stats(selected_loc)
             elif view_option == "Employee":
                 export_data = processor.get_employee_attendance(employee_id)
+            auth.user_db.record_event(auth.current_user, "data_export", view_option)
             
             st.sidebar.download_button(
                 label="Download as CSV",
-                data=export_data.to_csv(index=False).encode('utf-8'),
+                data=DataProcessor.format_for_display(export_data).to_csv(index=False).encode('utf-8'),
                 file_name=f"swr_data_{view_option.lower()}.csv",
                 mime='text/csv'
             )
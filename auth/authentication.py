@@ -19,6 +19,7 @@ class Authentication:
             if submit:
                 result = self.user_db.verify_user(username, password)
                 if result["authenticated"]:
+                    self.user_db.record_event(username, "login_success")
                     self.authenticated = True
                     self.current_user = username
                     self.is_admin = result["is_admin"]
@@ -26,12 +27,14 @@ class Authentication:
                     st.success("Login successful!")
                     st.experimental_rerun()
                 else:
+                    self.user_db.record_event(username, "login_failed")
                     st.error("Invalid username or password")
         
         return self.authenticated
     
     def logout(self):
         """Logout the current user"""
+        self.user_db.record_event(self.current_user, "logout")
         self.authenticated = False
         self.current_user = None
         self.is_admin = False
@@ -1,12 +1,101 @@
 import pandas as pd
 import sqlite3
 from passlib.hash import bcrypt
+import atexit
+import logging
 import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class AuditLog:
+    """Background writer that commits audit events in batches
+
+    record() only puts the event on a queue, so callers on the request
+    path never wait for SQLite. A single daemon thread per database collects
+    events for up to flush_interval seconds after the first one arrives, or
+    until batch_size events are waiting, and writes them in one transaction.
+    """
+
+    def __init__(self, db_path, batch_size=100, flush_interval=1.0):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="audit-log", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self, username, event_type, detail=None):
+        """Queue an audit event"""
+        event_time = datetime.now().isoformat(timespec="seconds")
+        self._queue.put((event_time, username, event_type, detail))
+
+    def close(self):
+        """Flush pending events and stop the writer thread"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        conn = sqlite3.connect(self.db_path)
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            # Keep collecting until the batch fills or the flush window closes
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            if batch:
+                try:
+                    conn.executemany("""
+                    INSERT INTO audit_log (event_time, username, event_type, detail)
+                    VALUES (?, ?, ?, ?)
+                    """, batch)
+                    conn.commit()
+                except sqlite3.Error:
+                    # Auditing must never take the app down
+                    logger.exception("Error writing audit log")
+        conn.close()
+
+
+# One writer per database file, shared by every UserDB in the process
+_audit_logs = {}
+_audit_logs_lock = threading.Lock()
+
+
+def get_audit_log(db_path):
+    """Return the shared AuditLog for db_path, starting it if needed"""
+    with _audit_logs_lock:
+        if db_path not in _audit_logs:
+            _audit_logs[db_path] = AuditLog(db_path)
+        return _audit_logs[db_path]
+
 
 class UserDB:
     def __init__(self):
         self.db_path = "auth/users.db"
         self._init_db()
+        self.audit_log = get_audit_log(self.db_path)
         
     def _init_db(self):
         """Initialize the user database"""
@@ -25,6 +114,24 @@ class UserDB:
             is_active BOOLEAN DEFAULT TRUE
         )
         """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_employee_id ON users (employee_id)")
+        # NOCASE so prefix searches with LIKE can use the index
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_username_nocase ON users (username COLLATE NOCASE)")
+        
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS audit_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            event_time TEXT NOT NULL,
+            username TEXT,
+            event_type TEXT NOT NULL,
+            detail TEXT
+        )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_log_event_time ON audit_log (event_time)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_log_username ON audit_log (username, event_time)")
+        
+        # WAL lets readers continue while the audit writer commits
+        cursor.execute("PRAGMA journal_mode=WAL")
         
         # Create admin if not exists
         cursor.execute("SELECT * FROM users WHERE username='admin'")
@@ -93,9 +200,56 @@ class UserDB:
         
         return bool(result)
     
-    def get_all_users(self):
-        """Get all users for admin view"""
+    def get_users(self, search="", page=1, page_size=25):
+        """Get one page of users by username prefix or exact employee ID
+        
+        Returns the page as a DataFrame and the total number of matches.
+        """
+        where = ""
+        params = []
+        if search:
+            # Escape LIKE wildcards so the search is a plain prefix match
+            pattern = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            where = "WHERE username LIKE ? ESCAPE '\\' OR employee_id=?"
+            params = [pattern, search]
+        
         conn = sqlite3.connect(self.db_path)
-        df = pd.read_sql("SELECT id, username, employee_id, is_admin, is_active FROM users", conn)
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM users {where}", params)
+        total = cursor.fetchone()[0]
+        df = pd.read_sql(
+            f"""SELECT id, username, employee_id, is_admin, is_active FROM users {where}
+            ORDER BY id LIMIT ? OFFSET ?""",
+            conn,
+            params=params + [page_size, (page - 1) * page_size]
+        )
+        conn.close()
+        return df, total
+    
+    def record_event(self, username, event_type, detail=None):
+        """Record a login or admin action in the audit log"""
+        self.audit_log.record(username, event_type, detail)
+    
+    def get_audit_events(self, username=None, page=1, page_size=50):
+        """Get one page of audit events, newest first
+        
+        Returns the page as a DataFrame and the total number of matches.
+        """
+        where = ""
+        params = []
+        if username:
+            where = "WHERE username=?"
+            params = [username]
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM audit_log {where}", params)
+        total = cursor.fetchone()[0]
+        df = pd.read_sql(
+            f"""SELECT event_time, username, event_type, detail FROM audit_log {where}
+            ORDER BY event_time DESC, id DESC LIMIT ? OFFSET ?""",
+            conn,
+            params=params + [page_size, (page - 1) * page_size]
+        )
         conn.close()
-        return df
\ No newline at end of file
+        return df, total
@@ -129,9 +129,13 @@
 #         return loc_data
 
 import pandas as pd
-from datetime import datetime, time
 import numpy as np
 import streamlit as st
+from utils.shared_dataset import SharedDataset
+from utils.validation import (
+    ATTENDANCE_SCHEMA, EMPLOYEE_SCHEMA, SHIFT_SCHEMA,
+    missing_reference, quarantine, validate
+)
 
 class DataProcessor:
     def __init__(self):
@@ -139,6 +143,8 @@ class DataProcessor:
         self.shifts = None
         self.attendance = None
         self.merged_data = None
+        self.rejected_rows = None
+        self.shared = None
         
     @st.cache_data
     def load_data(_self, employee_path, shifts_path, attendance_path):
@@ -162,22 +168,42 @@ class DataProcessor:
         except Exception as e:
             st.error(f"Error loading data: {str(e)}")
             return None
+
+    def load_shared(self, directory, version=None):
+        """Map a dataset published by a builder process instead of parsing Excel"""
+        self.shared = SharedDataset(directory).open(version)
+        self.merged_data = self.shared.to_pandas()
+        if self.shared.rejected is not None:
+            self.rejected_rows = self.shared.rejected.to_pandas()
+        return self.merged_data
     
     def _clean_data(self):
-        """Clean and preprocess data"""
-        # Convert timestamps
-        self.attendance['Timestamp'] = pd.to_datetime(self.attendance['Timestamp'])
-        
+        """Validate inputs against their schemas and quarantine bad rows"""
+        reports = []
+
+        # Employees
+        employees, problems = validate(self.employees, EMPLOYEE_SCHEMA, "employee.xlsx")
+        self.employees, report = quarantine(employees, problems, "employee.xlsx")
+        reports.append(report)
+
+        # Shifts must belong to a known employee
+        shifts, problems = validate(self.shifts, SHIFT_SCHEMA, "shifts.xlsx")
+        problems["Unknown Employee_ID"] = missing_reference(shifts, self.employees, ['Employee_ID'])
+        self.shifts, report = quarantine(shifts, problems, "shifts.xlsx")
+        reports.append(report)
+
+        # Attendance must belong to a known shift
+        attendance, problems = validate(self.attendance, ATTENDANCE_SCHEMA, "attendance.xlsx")
+        problems["Unknown Employee_ID/Shift_ID"] = missing_reference(
+            attendance, self.shifts, ['Employee_ID', 'Shift_ID']
+        )
+        self.attendance, report = quarantine(attendance, problems, "attendance.xlsx")
+        reports.append(report)
+
+        self.rejected_rows = pd.concat(reports, ignore_index=True)
+
         # Extract date from timestamp
-        self.attendance['Date'] = self.attendance['Timestamp'].dt.date
-        
-        # Convert shift times
-        self.shifts['Shift_Date'] = pd.to_datetime(self.shifts['Shift_Date']).dt.date
-        self.shifts['Shift_Start'] = pd.to_datetime(self.shifts['Shift_Start'], format='%H:%M').dt.time
-        self.shifts['Shift_End'] = pd.to_datetime(self.shifts['Shift_End'], format='%H:%M').dt.time
-        
-        # Clean employee data
-        self.employees['Employee_ID'] = self.employees['Employee_ID'].astype(str)
+        self.attendance['Date'] = self.attendance['Timestamp'].dt.normalize()
 
     def _merge_data(self):
         """Merge all data sources"""
@@ -200,29 +226,17 @@ class DataProcessor:
 
     def _calculate_metrics(self):
         """Calculate attendance metrics"""
+        data = self.merged_data
+
         # Calculate late arrivals
-        def calculate_late_status(row):
-            if row['Type'] == 'Check-in':
-                shift_start = datetime.combine(row['Shift_Date'], row['Shift_Start'])
-                check_in = row['Timestamp']
-                if check_in > shift_start:
-                    return 'Late'
-                return 'On Time'
-            return None
-            
-        self.merged_data['Late_Status'] = self.merged_data.apply(calculate_late_status, axis=1)
+        shift_start = data['Shift_Date'] + data['Shift_Start']
+        late = pd.Series(np.where(data['Timestamp'] > shift_start, 'Late', 'On Time'), index=data.index)
+        data['Late_Status'] = late.where(data['Type'] == 'Check-in', None)
         
         # Calculate early departures
-        def calculate_early_departure(row):
-            if row['Type'] == 'Check-out':
-                shift_end = datetime.combine(row['Shift_Date'], row['Shift_End'])
-                check_out = row['Timestamp']
-                if check_out < shift_end:
-                    return 'Early'
-                return 'On Time'
-            return None
-            
-        self.merged_data['Early_Status'] = self.merged_data.apply(calculate_early_departure, axis=1)
+        shift_end = data['Shift_Date'] + data['Shift_End']
+        early = pd.Series(np.where(data['Timestamp'] < shift_end, 'Early', 'On Time'), index=data.index)
+        data['Early_Status'] = early.where(data['Type'] == 'Check-out', None)
         
         # Calculate shift duration
         check_ins = self.merged_data[self.merged_data['Type'] == 'Check-in']
@@ -257,3 +271,34 @@ class DataProcessor:
             on=['Employee_ID', 'Shift_ID'],
             how='left'
         )
+
+    @staticmethod
+    def format_for_display(frame):
+        """Render native date/time columns as dates and HH:MM for grids and exports"""
+        frame = frame.copy()
+        for column in ['Shift_Date', 'Date']:
+            if column in frame.columns:
+                frame[column] = frame[column].astype('datetime64[ns]').dt.strftime('%Y-%m-%d')
+        for column in ['Shift_Start', 'Shift_End']:
+            if column in frame.columns:
+                offset = frame[column].astype('timedelta64[ns]')
+                frame[column] = (pd.Timestamp(0) + offset).dt.strftime('%H:%M')
+        return frame
+
+    def _filter(self, column, value):
+        """Rows where column equals value, via the shared index when mapped"""
+        if self.shared is not None and column in self.shared.indexes:
+            return self.shared.lookup(column, value)
+        return self.merged_data[self.merged_data[column] == value]
+
+    def get_employee_attendance(self, employee_id):
+        """Get attendance data for specific employee"""
+        return self._filter('Employee_ID', employee_id)
+
+    def get_department_stats(self, department):
+        """Get statistics for specific department"""
+        return self._filter('Department', department)
+
+    def get_location_stats(self, location):
+        """Get statistics for specific location"""
+        return self._filter('Location', location)
@@ -0,0 +1,175 @@
+import os
+import shutil
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+# Columns that get a lookup index next to the dataset
+INDEX_COLUMNS = ['Employee_ID', 'Department', 'Location']
+
+
+class SharedDataset:
+    """Processed attendance data stored as memory-mappable Arrow files.
+
+    A builder process publishes versions with ``publish``; workers call
+    ``open`` and map the current version read-only, so every worker shares
+    the same pages through the OS page cache.
+
+    Layout::
+
+        <directory>/CURRENT                     name of the active version
+        <directory>/v<stamp>/merged.arrow       processed dataset
+        <directory>/v<stamp>/index_<col>.arrow  key -> start/stop into rows_<col>
+        <directory>/v<stamp>/rows_<col>.arrow   row positions grouped by key
+        <directory>/v<stamp>/rejected.arrow     rows quarantined by validation
+    """
+
+    def __init__(self, directory="data/shared", keep_versions=2):
+        self.directory = directory
+        self.keep_versions = keep_versions
+        self.version = None
+        self.table = None
+        self.rejected = None
+        self.indexes = {}
+
+    def publish(self, merged_data, rejected_rows=None):
+        """Write a new version and point CURRENT at it"""
+        os.makedirs(self.directory, exist_ok=True)
+        version = "v" + datetime.now().strftime("%Y%m%d%H%M%S%f")
+        tmp_dir = os.path.join(self.directory, f".{version}.tmp")
+        os.makedirs(tmp_dir)
+        try:
+            self._write_version(tmp_dir, merged_data, rejected_rows)
+            os.replace(tmp_dir, os.path.join(self.directory, version))
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        # Switch readers over atomically
+        pointer_tmp = os.path.join(self.directory, "CURRENT.tmp")
+        with open(pointer_tmp, "w") as f:
+            f.write(version)
+        os.replace(pointer_tmp, os.path.join(self.directory, "CURRENT"))
+
+        self._prune_versions()
+        return version
+
+    def _write_version(self, version_dir, merged_data, rejected_rows=None):
+        """Write the dataset, its indexes and the rejected rows into version_dir"""
+        table = pa.Table.from_pandas(merged_data, preserve_index=False)
+        self._write_table(os.path.join(version_dir, "merged.arrow"), table)
+
+        if rejected_rows is not None:
+            self._write_table(
+                os.path.join(version_dir, "rejected.arrow"),
+                pa.Table.from_pandas(rejected_rows, preserve_index=False)
+            )
+
+        # Index: row positions sorted by key, plus the key boundaries
+        for column in INDEX_COLUMNS:
+            if column not in merged_data.columns:
+                continue
+            keys = merged_data[column].astype("string").reset_index(drop=True)
+            # Rows without a key are not reachable through the index
+            keys = keys[keys.notna()]
+            rows = keys.sort_values(kind="stable").index.to_numpy()
+            sorted_keys = keys.loc[rows].reset_index(drop=True)
+            first = (~sorted_keys.duplicated()).to_numpy()
+            starts = sorted_keys.index[first].to_numpy()
+            # Each key runs until the next key starts, the last one to the end
+            stops = [*starts[1:], len(sorted_keys)] if len(starts) else []
+            index_table = pa.table({
+                "key": pa.array(sorted_keys[first].tolist(), type=pa.string()),
+                "start": pa.array(starts, type=pa.int64()),
+                "stop": pa.array(stops, type=pa.int64()),
+            })
+            self._write_table(os.path.join(version_dir, f"index_{column}.arrow"), index_table)
+            self._write_table(
+                os.path.join(version_dir, f"rows_{column}.arrow"),
+                pa.table({"row": pa.array(rows, type=pa.int64())})
+            )
+
+    def current_version(self):
+        """Return the version CURRENT points at, or None if nothing is published"""
+        try:
+            with open(os.path.join(self.directory, "CURRENT")) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def open(self, version=None):
+        """Map a published version read-only"""
+        version = version or self.current_version()
+        if version is None:
+            raise FileNotFoundError(f"No shared dataset published in {self.directory}")
+        version_dir = os.path.join(self.directory, version)
+
+        self.table = self._map_table(os.path.join(version_dir, "merged.arrow"))
+        rejected_path = os.path.join(version_dir, "rejected.arrow")
+        self.rejected = self._map_table(rejected_path) if os.path.exists(rejected_path) else None
+        self.indexes = {}
+        for column in INDEX_COLUMNS:
+            index_path = os.path.join(version_dir, f"index_{column}.arrow")
+            if not os.path.exists(index_path):
+                continue
+            index_table = self._map_table(index_path)
+            bounds = dict(zip(
+                index_table.column("key").to_pylist(),
+                zip(index_table.column("start").to_pylist(), index_table.column("stop").to_pylist())
+            ))
+            rows = self._map_table(os.path.join(version_dir, f"rows_{column}.arrow")).column("row")
+            self.indexes[column] = (bounds, rows)
+
+        self.version = version
+        return self
+
+    def to_pandas(self):
+        """Wrap the mapped table in a DataFrame without copying column data"""
+        return self.table.to_pandas(types_mapper=pd.ArrowDtype)
+
+    def lookup(self, column, key):
+        """Return the rows where ``column`` equals ``key`` using its index"""
+        bounds, rows = self.indexes[column]
+        start, stop = (0, 0) if pd.isna(key) else bounds.get(str(key), (0, 0))
+        subset = self.table.take(rows.slice(start, stop - start))
+        return subset.to_pandas(types_mapper=pd.ArrowDtype)
+
+    def _prune_versions(self):
+        """Remove old versions beyond ``keep_versions``"""
+        versions = sorted(
+            name for name in os.listdir(self.directory)
+            if name.startswith("v") and os.path.isdir(os.path.join(self.directory, name))
+        )
+        for name in versions[:-self.keep_versions]:
+            # Workers still mapping an old version keep their pages until they remap
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    @staticmethod
+    def _write_table(path, table):
+        # Uncompressed so the file can be mapped without decoding
+        with pa.OSFile(path, "wb") as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+    @staticmethod
+    def _map_table(path):
+        return ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+
+if __name__ == "__main__":
+    # Builder entry point: python -m utils.shared_dataset
+    from utils.data_processor import DataProcessor
+
+    processor = DataProcessor()
+    merged = processor.load_data(
+        employee_path="data/employee.xlsx",
+        shifts_path="data/shifts.xlsx",
+        attendance_path="data/attendance.xlsx"
+    )
+    if merged is None:
+        raise SystemExit("Failed to build dataset")
+    directory = os.environ.get("SHARED_DATASET_DIR", "data/shared")
+    version = SharedDataset(directory).publish(merged, processor.rejected_rows)
+    print(f"Published {version} to {directory}")
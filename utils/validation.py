@@ -0,0 +1,158 @@
+from datetime import datetime, time
+
+import pandas as pd
+
+# Declared input schemas. Each column has a dtype and, for dates/times, an
+# explicit format so pandas never has to infer one. Required columns reject
+# rows with blank values; optional ones pass them through as NA. Extra
+# columns pass through untouched.
+EMPLOYEE_SCHEMA = {
+    'columns': {
+        'Employee_ID': {'dtype': 'string', 'required': True},
+        'full_name': {'dtype': 'string', 'required': False},
+        'Department': {'dtype': 'string', 'required': False},
+        'Designation': {'dtype': 'string', 'required': False},
+        'Base_Location': {'dtype': 'string', 'required': False},
+    },
+    'key': ['Employee_ID'],
+}
+
+SHIFT_SCHEMA = {
+    'columns': {
+        'Employee_ID': {'dtype': 'string', 'required': True},
+        'Shift_ID': {'dtype': 'string', 'required': True},
+        'Shift_Date': {'dtype': 'datetime', 'format': '%Y-%m-%d', 'required': True},
+        'Shift_Start': {'dtype': 'time', 'format': '%H:%M', 'required': True},
+        'Shift_End': {'dtype': 'time', 'format': '%H:%M', 'required': True},
+    },
+    'key': ['Employee_ID', 'Shift_ID'],
+}
+
+ATTENDANCE_SCHEMA = {
+    'columns': {
+        'Employee_ID': {'dtype': 'string', 'required': True},
+        'Shift_ID': {'dtype': 'string', 'required': True},
+        'Timestamp': {'dtype': 'datetime', 'format': 'ISO8601', 'required': True},
+        'Type': {'dtype': 'string', 'required': True, 'allowed': ['Check-in', 'Check-out']},
+    },
+    'key': ['Employee_ID', 'Shift_ID', 'Type'],
+}
+
+REPORT_COLUMNS = ['Source', 'Row', 'Reason']
+
+
+class SchemaError(ValueError):
+    """Raised when an input file does not have the declared columns"""
+
+
+def _parse_string(values):
+    """Parse text, keeping whole numbers read as floats as integer strings"""
+    text = values.astype('string')
+    if pd.api.types.is_float_dtype(values):
+        # A blank cell makes read_excel return a float column (101 -> 101.0)
+        whole = values.notna() & (values % 1 == 0)
+        text[whole] = values[whole].astype('int64').astype('string')
+    # Whitespace-only cells are blank, not empty-string keys
+    return text.str.strip().replace('', pd.NA)
+
+
+def _parse_time(values, fmt):
+    """Parse time of day as an offset from midnight
+
+    Accepts text in fmt as well as the time and datetime values Excel
+    cells come back as.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values - values.dt.normalize()
+
+    stamps = pd.to_datetime(values.astype(str).str.strip(), format=fmt, errors='coerce')
+    parsed = (stamps - stamps.dt.normalize()).astype('timedelta64[ns]')
+    if values.dtype != object:
+        return parsed
+
+    # Only cells that are not text in fmt need per-value type dispatch
+    failed = values[parsed.isna() & values.notna()]
+    if failed.empty:
+        return parsed
+    is_time = failed.map(lambda value: isinstance(value, time))
+    is_datetime = failed.map(lambda value: isinstance(value, datetime))
+    if is_time.any():
+        parsed[is_time[is_time].index] = pd.to_timedelta(failed[is_time].astype(str), errors='coerce')
+    if is_datetime.any():
+        datetimes = pd.to_datetime(failed[is_datetime])
+        parsed[is_datetime[is_datetime].index] = datetimes - datetimes.dt.normalize()
+    return parsed
+
+
+def _parse_column(values, spec):
+    """Parse a raw column into its native dtype, invalid values become missing"""
+    dtype = spec['dtype']
+    if dtype == 'string':
+        return _parse_string(values)
+    if dtype == 'datetime':
+        return pd.to_datetime(values, format=spec['format'], errors='coerce')
+    if dtype == 'time':
+        return _parse_time(values, spec['format'])
+    raise ValueError(f"Unknown dtype in schema: {dtype}")
+
+
+def validate(frame, schema, source):
+    """Parse frame against schema and flag invalid rows
+
+    Returns the parsed frame and a dict of reason -> boolean mask of
+    offending rows. Raises SchemaError if declared columns are missing.
+    """
+    missing = [column for column in schema['columns'] if column not in frame.columns]
+    if missing:
+        raise SchemaError(f"{source} is missing columns: {', '.join(missing)}")
+
+    frame = frame.copy()
+    problems = {}
+    for column, spec in schema['columns'].items():
+        raw = frame[column]
+        parsed = _parse_column(raw, spec)
+        # Blank text parses to NA, so for strings any NA is a missing value
+        absent = parsed.isna() if spec['dtype'] == 'string' else raw.isna()
+        if spec['required']:
+            problems[f"Missing {column}"] = absent
+        problems[f"Invalid {column}"] = parsed.isna() & ~absent
+        if 'allowed' in spec:
+            problems[f"Unexpected {column}"] = parsed.notna() & ~parsed.isin(spec['allowed'])
+        frame[column] = parsed
+
+    key = schema.get('key')
+    if key:
+        # Only rows that are otherwise valid can shadow each other
+        invalid = pd.concat(problems.values(), axis=1).any(axis=1)
+        candidates = ~invalid & frame[key].notna().all(axis=1)
+        duplicate = pd.Series(False, index=frame.index)
+        duplicate[candidates] = frame[candidates].duplicated(key, keep='first')
+        problems[f"Duplicate {'/'.join(key)}"] = duplicate
+
+    return frame, problems
+
+
+def missing_reference(frame, reference, columns):
+    """Mask of rows whose key columns have no match in reference"""
+    keys = pd.MultiIndex.from_frame(frame[columns])
+    known = pd.MultiIndex.from_frame(reference[columns])
+    return pd.Series(~keys.isin(known), index=frame.index)
+
+
+def quarantine(frame, problems, source):
+    """Split frame into valid rows and a report of rejected rows"""
+    reports = []
+    rejected = pd.Series(False, index=frame.index)
+    for reason, mask in problems.items():
+        if not mask.any():
+            continue
+        rejected |= mask
+        reports.append(pd.DataFrame({
+            'Source': source,
+            # Spreadsheet row number, counting the header row
+            'Row': frame.index[mask] + 2,
+            'Reason': reason,
+        }))
+
+    report = pd.concat(reports, ignore_index=True) if reports else pd.DataFrame(columns=REPORT_COLUMNS)
+    return frame[~rejected], report